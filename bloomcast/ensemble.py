@@ -17,6 +17,7 @@ the first spring diatom phytoplankon bloom in the Strait of Georgia.
 """
 from collections import OrderedDict
 import copy
+import functools
 import logging
 import shutil
 import os
@@ -603,6 +604,7 @@ def get_forcing_data(config, log):
     rivers_processor.make_forcing_data_files()
 
 
+@functools.lru_cache(maxsize=256)
 def two_yr_suffix(year):
     """Return a suffix string of the form ``_XXYY`` based on year,
     where XX = the last 2 digits of year - 1,
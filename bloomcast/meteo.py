@@ -66,7 +66,7 @@ class MeteoProcessor(ClimateDataProcessor):
             for qty in self.config.climate.meteo.quantities:
                 self.process_data(qty, end_date=self.config.data_date)
                 log.debug('latest {0} {1}'.format(qty, self.data[qty][-1]))
-                files[qty].writelines(self.format_data(qty))
+                files[qty].write(''.join(self.format_data(qty)))
 
     def read_temperature(self, record):
         """Read air temperature from XML data object.
@@ -15,10 +15,12 @@
 """Rivers flows forcing data processing module for SoG-bloomcast project.
 """
 import datetime
+import functools
 import logging
 import sys
 
 import arrow
+import numpy as np
 import requests
 import bs4
 
@@ -30,6 +32,9 @@ from .utils import (
 
 log = logging.getLogger('bloomcast.rivers')
 
+# Limits parsing of WaterOffice pages to the data table
+_TABLE_STRAINER = bs4.SoupStrainer('table')
+
 
 class RiversProcessor(ForcingDataProcessor):
     """River flows forcing data processor.
@@ -54,7 +59,7 @@ class RiversProcessor(ForcingDataProcessor):
             self.process_data(river, scale_factor, end_date=self.config.data_date)
             output_file = self.config.rivers.output_files[river]
             with open(output_file, 'wt') as file_obj:
-                file_obj.writelines(self.format_data(river))
+                file_obj.write(''.join(self.format_data(river)))
             log.debug(
                 'latest {0} river flow {1}'
                 .format(river, self.data[river][-1]))
@@ -80,7 +85,8 @@ class RiversProcessor(ForcingDataProcessor):
             .format(
                 river, start_year,
                 self.config.data_date.format('YYYY-MM-DD')))
-        soup = bs4.BeautifulSoup(response.content, 'html.parser')
+        soup = bs4.BeautifulSoup(
+            response.content, 'lxml', parse_only=_TABLE_STRAINER)
         self.raw_data = soup.find('table')
 
     def _date_params(self, start_year):
@@ -91,39 +97,63 @@ class RiversProcessor(ForcingDataProcessor):
         requests to the :kbd:`wateroffice.gc.ca` site.
 
         The values are date components as integers.
+
+        :kbd:`config.data_date` may be an :py:class:`arrow.Arrow`
+        or a :py:class:`datetime.date`.
         """
-        end_date = self.config.data_date.shift(days=+1)
-        params = {
-            'startDate': arrow.get(start_year, 1, 1).format('YYYY-MM-DD'),
-            'endDate': end_date.format('YYYY-MM-DD')
-        }
-        return params
+        data_date = self.config.data_date
+        if hasattr(data_date, 'date'):
+            data_date = data_date.date()
+        # Copy so that callers can't change the cached dict
+        return dict(_date_params_for(start_year, data_date))
 
     def process_data(self, qty, scale_factor=1, end_date=arrow.now().floor('day')):
         """Process data from BeautifulSoup parser object to a list of
         hourly timestamps and data values.
         """
-        tds = self.raw_data.findAll('td')
-        timestamps = (td.string for td in tds[::2])
-        flows = (td.text for td in tds[1::2])
-        data_day = self.read_datestamp(tds[0].string)
-        flow_sum = count = 0
-        self.data[qty] = []
-        for timestamp, flow in zip(timestamps, flows):
-            datestamp = self.read_datestamp(timestamp)
-            if datestamp > end_date.date():
-                break
-            if datestamp == data_day:
-                flow_sum += self._convert_flow(flow, scale_factor)
-                count += 1
-            else:
-                self.data[qty].append((data_day, flow_sum / count))
-                data_day = datestamp
-                flow_sum = self._convert_flow(flow, scale_factor)
-                count = 1
-        self.data[qty].append((data_day, flow_sum / count))
+        rows = (
+            tr.find_all('td', limit=2) for tr in self.raw_data.find_all('tr'))
+        # Skip header rows; they contain th rather than td elements
+        rows = [tds for tds in rows if len(tds) == 2]
+        timestamps = np.array(
+            [timestamp_td.string for timestamp_td, flow_td in rows],
+            dtype='datetime64[s]')
+        datestamps = timestamps.astype('datetime64[D]')
+        # Rows are in time order, so drop them from the first one that is
+        # after end_date
+        after_end = np.flatnonzero(
+            datestamps > np.datetime64(end_date.date()))
+        if after_end.size:
+            datestamps = datestamps[:after_end[0]]
+            rows = rows[:after_end[0]]
+        if not rows:
+            raise ValueError(
+                'No {qty} river data on or before {end_date:%Y-%m-%d}'
+                .format(qty=qty, end_date=end_date.date()))
+        flows = [
+            self._read_flow(flow_td, scale_factor)
+            for timestamp_td, flow_td in rows]
+        # Average the flows for each day
+        days, day_indices = np.unique(datestamps, return_inverse=True)
+        day_flows = (
+            np.bincount(day_indices, weights=flows)
+            / np.bincount(day_indices))
+        self.data[qty] = list(zip(days.tolist(), day_flows.tolist()))
         self.patch_data(qty)
 
+    def _read_flow(self, flow_td, scale_factor):
+        """Read a flow data value from a BeautifulSoup table cell
+        object and return it as a float.
+
+        Uses the full precision value in the cell's `data-order`
+        attribute when it is present and numeric, otherwise the
+        display text.
+        """
+        try:
+            return float(flow_td['data-order']) * scale_factor
+        except (KeyError, ValueError):
+            return self._convert_flow(flow_td.text, scale_factor)
+
     def _convert_flow(self, flow_string, scale_factor):
         """Convert a flow data value from a string to a float.
 
@@ -136,35 +166,32 @@ class RiversProcessor(ForcingDataProcessor):
             # Ignore training `*`
             return float(flow_string[:-1].replace(',', '')) * scale_factor
 
-    def read_datestamp(self, string):
-        """Read datestamp from BeautifulSoup parser object and return
-        it as a date instance.
-        """
-        return datetime.datetime.strptime(string, '%Y-%m-%d %H:%M:%S').date()
-
     def patch_data(self, qty):
         """Patch missing data values by interpolation.
         """
-        i = 0
         data = self.data[qty]
-        gap_count = 0
-        while True:
-            try:
-                delta = (data[i + 1][0] - data[i][0]).days
-            except IndexError:
-                break
-            if delta > 1:
-                gap_start = i + 1
-                for j in range(1, delta):
-                    missing_date = data[i][0] + j * datetime.timedelta(days=1)
-                    data.insert(i + j, (missing_date, None))
+        ordinals = [item[0].toordinal() for item in data]
+        gap_indices = np.flatnonzero(np.diff(ordinals) > 1).tolist()
+        patched = []
+        gaps = []
+        last = 0
+        debug = log.isEnabledFor(logging.DEBUG)
+        for i in gap_indices:
+            patched.extend(data[last:i + 1])
+            gap_start = len(patched)
+            for ordinal in range(ordinals[i] + 1, ordinals[i + 1]):
+                missing_date = datetime.date.fromordinal(ordinal)
+                patched.append((missing_date, None))
+                if debug:
                     log.debug(
-                        '{qty} river data patched for {date}'
-                        .format(qty=qty, date=missing_date))
-                    gap_count += 1
-                gap_end = i + delta - 1
-                self.interpolate_values(qty, gap_start, gap_end)
-            i += delta
+                        '%s river data patched for %s', qty, missing_date)
+            gaps.append((gap_start, len(patched) - 1))
+            last = i + 1
+        patched.extend(data[last:])
+        gap_count = len(patched) - len(data)
+        data[:] = patched
+        for gap_start, gap_end in gaps:
+            self.interpolate_values(qty, gap_start, gap_end)
         if gap_count:
             log.debug(
                 '{count} {qty} river data values patched; '
@@ -188,10 +215,36 @@ class RiversProcessor(ForcingDataProcessor):
         for data in self.data[qty]:
             datestamp = data[0]
             flow = data[1]
-            line = '{0:%Y %m %d} {1:e}\n'.format(datestamp, flow)
+            # Formatting the date fields as integers avoids a strftime()
+            # call per line
+            line = '%04d %02d %02d %e\n' % (
+                datestamp.year, datestamp.month, datestamp.day, flow)
             yield line
 
 
+@functools.lru_cache(maxsize=16)
+def _date_params_for(start_year, data_date):
+    """Return a dict of the start and end date parameters for river
+    flow data requests from the specified start year to the day after
+    data_date.
+
+    :arg start_year: Year to start the river flow data at.
+    :type start_year: int
+
+    :arg data_date: Date of the most recent forcing data.
+    :type data_date: :py:class:`datetime.date`
+
+    :returns: startDate and endDate request parameters.
+    :rtype: dict
+    """
+    end_date = data_date + datetime.timedelta(days=1)
+    params = {
+        'startDate': f'{start_year:04d}-01-01',
+        'endDate': end_date.isoformat()
+    }
+    return params
+
+
 def run(config_file):
     """Process river flows forcing data into SOG forcing data files by
     running the RiversProcessor object independent of bloomcast.
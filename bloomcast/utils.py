@@ -188,6 +188,28 @@ class Config(object):
         return infile_dict
 
 
+def interp_gap(last_value, next_value, gap_length):
+    """Return a list of values for a gap in evenly spaced data calculated
+    by linear interpolation between the values on either side of the gap.
+
+    :arg last_value: Data value immediately before the gap.
+    :type last_value: float
+
+    :arg next_value: Data value immediately after the gap.
+    :type next_value: float
+
+    :arg gap_length: Number of missing values in the gap.
+    :type gap_length: int
+
+    :returns: Interpolated values to fill the gap.
+    :rtype: list
+    """
+    values = np.interp(
+        np.arange(1, gap_length + 1),
+        (0, gap_length + 1), (last_value, next_value))
+    return values.tolist()
+
+
 class ForcingDataProcessor(object):
     """Base class for forcing data processors.
     """
@@ -239,19 +261,23 @@ class ForcingDataProcessor(object):
     def patch_data(self, qty):
         """Patch missing data values by interpolation.
         """
-        gap_start = gap_end = None
-        gap_count = 0
-        for i, data in enumerate(self.data[qty]):
-            if self._valuegetter(data[1]) is None:
-                gap_start = i if gap_start is None else gap_start
-                gap_end = i
+        missing = np.array(
+            [self._valuegetter(data[1]) is None for data in self.data[qty]],
+            dtype=bool)
+        gap_count = np.count_nonzero(missing)
+        if log.isEnabledFor(logging.DEBUG):
+            for i in np.flatnonzero(missing):
                 log.debug(
-                    '{qty} data patched for {date}'
-                    .format(qty=qty, date=data[0]))
-                gap_count += 1
-            elif gap_start is not None:
-                self.interpolate_values(qty, gap_start, gap_end)
-                gap_start = gap_end = None
+                    '%s data patched for %s', qty, self.data[qty][i][0])
+        # Gap boundaries are where the missing mask changes state;
+        # padding ensures that leading and trailing gaps are closed
+        edges = np.flatnonzero(
+            np.diff(np.concatenate(([0], missing.view(np.int8), [0]))))
+        for gap_start, gap_stop in zip(edges[::2], edges[1::2]):
+            if gap_stop < len(missing):
+                # Gaps at the end of the data have no next value to
+                # interpolate towards
+                self.interpolate_values(qty, int(gap_start), int(gap_stop) - 1)
         if gap_count:
             log.debug(
                 '{count} {qty} data values patched; '
@@ -283,11 +309,11 @@ class ForcingDataProcessor(object):
             )
         last_value = self.data[qty][gap_start - 1][1]
         next_value = self.data[qty][gap_end + 1][1]
-        delta = (next_value - last_value) / (gap_end - gap_start + 2)
-        for i in range(gap_end - gap_start + 1):
-            timestamp = self.data[qty][gap_start + i][0]
-            value = last_value + delta * (i + 1)
-            self.data[qty][gap_start + i] = (timestamp, value)
+        values = interp_gap(last_value, next_value, gap_hours)
+        self.data[qty][gap_start:gap_end + 1] = [
+            (data[0], value)
+            for data, value in zip(
+                self.data[qty][gap_start:gap_end + 1], values)]
 
 
 class ClimateDataProcessor(ForcingDataProcessor):
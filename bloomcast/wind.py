@@ -26,11 +26,16 @@ from .utils import (
     ClimateDataProcessor,
     Config,
     SOG_Timeseries,
+    interp_gap,
 )
 
 
 log = logging.getLogger('bloomcast.wind')
 
+# Zero-padded day and month strings for forcing data file lines
+_DAYS = ['{:02d}'.format(day) for day in range(32)]
+_MONTHS = ['{:02d}'.format(month) for month in range(13)]
+
 
 class WindProcessor(ClimateDataProcessor):
     """Wind forcing data processor.
@@ -56,7 +61,7 @@ class WindProcessor(ClimateDataProcessor):
         data_date = arrow.get(self.data['wind'][-1][0]).replace(hour=0)
         output_file = self.config.climate.wind.output_files['wind']
         with open(output_file, 'wt') as file_obj:
-            file_obj.writelines(self.format_data())
+            file_obj.write(''.join(self.format_data()))
         return data_date
 
     def read_wind_velocity(self, record):
@@ -115,16 +120,13 @@ class WindProcessor(ClimateDataProcessor):
                 .format(self.data[qty][gap_start][0]))
         last_cross_wind, last_along_wind = self.data[qty][gap_start - 1][1]
         next_cross_wind, next_along_wind = self.data[qty][gap_end + 1][1]
-        delta_cross_wind = (
-            (next_cross_wind - last_cross_wind) / (gap_hours + 1))
-        delta_along_wind = (
-            (next_along_wind - last_along_wind) / (gap_hours + 1))
-        for i in range(gap_end - gap_start + 1):
-            timestamp = self.data[qty][gap_start + i][0]
-            cross_wind = last_cross_wind + delta_cross_wind * (i + 1)
-            along_wind = last_along_wind + delta_along_wind * (i + 1)
-            self.data[qty][gap_start + i] = (
-                timestamp, (cross_wind, along_wind))
+        cross_winds = interp_gap(last_cross_wind, next_cross_wind, gap_hours)
+        along_winds = interp_gap(last_along_wind, next_along_wind, gap_hours)
+        self.data[qty][gap_start:gap_end + 1] = [
+            (data[0], (cross_wind, along_wind))
+            for data, cross_wind, along_wind in zip(
+                self.data[qty][gap_start:gap_end + 1],
+                cross_winds, along_winds)]
 
     def format_data(self):
         """Generate lines of wind forcing data in the format expected
@@ -145,8 +147,11 @@ class WindProcessor(ClimateDataProcessor):
         for data in self.data['wind']:
             timestamp = data[0]
             wind = data[1]
-            line = '{0:%d %m %Y} {1:.1f} {2:f} {3:f}\n'.format(
-                timestamp, timestamp.hour, wind[0], wind[1])
+            # Looking up the zero-padded date fields avoids a strftime()
+            # call per line
+            line = '%s %s %d %.1f %f %f\n' % (
+                _DAYS[timestamp.day], _MONTHS[timestamp.month],
+                timestamp.year, timestamp.hour, wind[0], wind[1])
             yield line
 
 
@@ -41,6 +41,7 @@ install_requires = [
     'arrow',
     'BeautifulSoup4',
     'cliff',
+    'lxml',
     'matplotlib',
     'numpy',
     'PyYAML',
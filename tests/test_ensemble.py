@@ -14,35 +14,83 @@
 
 """Unit tests for SoG-bloomcast ensemble module.
 """
+import copy
 import datetime
+import os
 from unittest.mock import (
     Mock,
-    mock_open,
     patch,
 )
 import unittest.mock as mock
 
 import arrow
-import cliff.app
 import pytest
 
 
+# Dates used in take_action and find_member tests
+_D_2014_03_12 = arrow.get(2014, 3, 12)
+_D_2014_03_21 = arrow.get(2014, 3, 21)
+_D_2014_03_25 = arrow.get(2014, 3, 25)
+_D_2014_03_26 = arrow.get(2014, 3, 26)
+_D_2014_03_27 = arrow.get(2014, 3, 27)
+_D_2014_03_29 = arrow.get(2014, 3, 29)
+
+# Run start dates used in take_action tests
+_RSD_2012 = datetime.datetime(2012, 9, 19)
+_RSD_2013 = datetime.datetime(2013, 9, 19)
+
+
+# Attributes of the ensemble config Mocks
+_ENSEMBLE_CONFIG_ATTRS = (
+    'ensemble',
+    'run_SOG',
+    'SOG_executable',
+    'run_start_date',
+    'std_phys_ts_outfile',
+    'user_phys_ts_outfile',
+    'std_bio_ts_outfile',
+    'user_bio_ts_outfile',
+    'std_chem_ts_outfile',
+    'user_chem_ts_outfile',
+    'profiles_outfile_base',
+    'user_profiles_outfile_base',
+    'halocline_outfile',
+    'Hoffmueller_profiles_outfile',
+    'user_Hoffmueller_profiles_outfile',
+)
+_ENSEMBLE_ATTRS = (
+    'max_concurrent_jobs',
+    'base_infile',
+    'start_year',
+    'end_year',
+    'forcing_data_file_roots',
+)
+
+
+def _devnull_open(*args, **kwargs):
+    """Stand-in for open() that discards everything written to the file.
+    """
+    return open(os.devnull, 'wt')
+
+
 @pytest.fixture
 def ensemble():
     import bloomcast.ensemble
-    return bloomcast.ensemble.Ensemble(Mock(spec=cliff.app.App), [])
+    return bloomcast.ensemble.Ensemble(Mock(), [])
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def ensemble_module():
     import bloomcast.ensemble
     return bloomcast.ensemble
 
 
-@pytest.fixture(scope='function')
-def ensemble_config():
+@pytest.fixture(scope='session')
+def ensemble_config_template():
     config = Mock(
+        spec_set=_ENSEMBLE_CONFIG_ATTRS,
         ensemble=Mock(
+            spec_set=_ENSEMBLE_ATTRS,
             max_concurrent_jobs=32,
             base_infile='foo.yaml',
             start_year=1981,
@@ -71,6 +119,43 @@ def ensemble_config():
     return config
 
 
+@pytest.fixture
+def ensemble_config(ensemble_config_template):
+    # Attributes set on the shallow copy don't leak into the template,
+    # but its child Mocks are shared, so tests must use monkeypatch to
+    # change them
+    return copy.copy(ensemble_config_template)
+
+
+@pytest.fixture(scope='class')
+def infile_edits(ensemble_config_template):
+    """Run _create_infile_edits once and return the ensemble object
+    and the infile edits dict that was dumped to YAML.
+    """
+    import bloomcast.ensemble
+    ensemble = bloomcast.ensemble.Ensemble(Mock(), [])
+    ensemble.config = copy.copy(ensemble_config_template)
+    ensemble.log = Mock()
+    with patch('bloomcast.ensemble.yaml') as m_yaml:
+        with patch('bloomcast.ensemble.open', _devnull_open, create=True):
+            ensemble._create_infile_edits()
+    return ensemble, m_yaml.safe_dump.call_args[0][0]
+
+
+@pytest.fixture(scope='class')
+def loaded_bio(ensemble_config_template):
+    """Run _load_biology_timeseries once and return the ensemble object
+    and the SOG_Timeseries mock.
+    """
+    import bloomcast.ensemble
+    ensemble = bloomcast.ensemble.Ensemble(Mock(), [])
+    ensemble.config = copy.copy(ensemble_config_template)
+    ensemble.edit_files = [(1981, 'foo_8081.yaml', '_8081')]
+    with patch('bloomcast.utils.SOG_Timeseries') as m_SOG_ts:
+        ensemble._load_biology_timeseries()
+    return ensemble, m_SOG_ts
+
+
 def test_get_parser(ensemble):
     parser = ensemble.get_parser('bloomcast ensemble')
     assert parser.prog == 'bloomcast ensemble'
@@ -80,7 +165,13 @@ def test_get_parser(ensemble):
 class TestEnsembleTakeAction():
     """Unit tests for take_action method of Ensemble class.
     """
-    @patch('bloomcast.ensemble.utils.Config')
+    @pytest.fixture(autouse=True)
+    def m_config(self, monkeypatch):
+        m_config = Mock(name='Config')
+        monkeypatch.setattr('bloomcast.ensemble.utils.Config', m_config)
+        monkeypatch.setattr('bloomcast.ensemble.configure_logging', Mock())
+        return m_config
+
     def test_get_forcing_data_conflicts_w_data_date(self, m_config, ensemble):
         parsed_args = Mock(
             config_file='config.yaml',
@@ -88,15 +179,13 @@ class TestEnsembleTakeAction():
         )
         m_config.return_value = Mock(get_forcing_data=False)
         ensemble.log = Mock()
-        with patch('bloomcast.ensemble.configure_logging'):
-            ensemble.take_action(parsed_args)
+        ensemble.take_action(parsed_args)
         ensemble.log.debug.assert_called_once_with(
             'This will not end well: get_forcing_data=False '
             'and data_date=None'
         )
 
-    @patch('bloomcast.ensemble.utils.Config')
-    @patch('bloomcast.ensemble.arrow.now', return_value=arrow.get(2014, 3, 12))
+    @patch('bloomcast.ensemble.arrow.now', return_value=_D_2014_03_12)
     def test_no_river_flow_data_by_date(self, m_now, m_config, ensemble):
         parsed_args = Mock(
             config_file='config.yaml',
@@ -104,105 +193,74 @@ class TestEnsembleTakeAction():
         )
         m_config.return_value = Mock(
             get_forcing_data=True,
-            run_start_date=datetime.datetime(2012, 9, 19),
+            run_start_date=_RSD_2012,
         )
         ensemble.log = Mock()
-        with patch('bloomcast.ensemble.configure_logging'):
-            ensemble.take_action(parsed_args)
+        ensemble.take_action(parsed_args)
         ensemble.log.error.assert_called_once_with(
             'A bloomcast run starting 2012-09-19 cannot be done today '
             'because there are no river flow data available prior to '
             '2012-09-12'
         )
 
-    @patch('bloomcast.ensemble.utils.Config')
-    @patch('bloomcast.ensemble.arrow.now', return_value=arrow.get(2014, 3, 12))
-    def test_no_new_wind_data(self, m_now, m_config, ensemble):
+    @patch('bloomcast.ensemble.arrow.now', return_value=_D_2014_03_12)
+    def test_no_new_wind_data(self, m_now, m_config, ensemble, monkeypatch):
         parsed_args = Mock(
             config_file='config.yaml',
             data_date=None,
         )
         m_config.return_value = Mock(
             get_forcing_data=True,
-            run_start_date=datetime.datetime(2013, 9, 19),
+            run_start_date=_RSD_2013,
         )
         ensemble.log = Mock()
-        p_config_logging = patch('bloomcast.ensemble.configure_logging')
 
         def get_forcing_data(config, log):
-            config.data_date = arrow.get(2014, 3, 12)
+            config.data_date = _D_2014_03_12
             raise ValueError
-        p_get_forcing_data = patch(
-            'bloomcast.ensemble.get_forcing_data',
-            side_effect=get_forcing_data,
-        )
-        with p_config_logging, p_get_forcing_data:
-            ensemble.take_action(parsed_args)
+        monkeypatch.setattr(
+            'bloomcast.ensemble.get_forcing_data', get_forcing_data)
+        ensemble.take_action(parsed_args)
         ensemble.log.info.assert_called_once_with(
             'Wind data date 2014-03-12 is unchanged since last run'
         )
 
-    @patch('bloomcast.ensemble.yaml')
-    @patch('bloomcast.ensemble.utils.Config')
-    def test_create_infile_edits_forcing_data(
-        self, m_config, m_yaml, ensemble, ensemble_config,
-    ):
-        ensemble.config = ensemble_config
-        ensemble.log = Mock()
-        with patch('bloomcast.ensemble.open', mock_open(), create=True):
-            ensemble._create_infile_edits()
-        result = m_yaml.safe_dump.call_args[0][0]['forcing_data']
-        assert result['avg_historical_wind_file']['value'] == 'wind_data_8081'
-        expected_keys = (
-            'avg_historical_wind_file avg_historical_air_temperature_file '
-            'avg_historical_cloud_file avg_historical_humidity_file '
-            'avg_historical_major_river_file avg_historical_minor_river_file'
-            .split())
-        for key in expected_keys:
-            assert result[key]['value'] is not None
-        ensemble.log.debug.assert_called_once_with(
-            'wrote infile edit file foo_8081.yaml'
-        )
-
-    @patch('bloomcast.ensemble.yaml')
-    @patch('bloomcast.ensemble.utils.Config')
-    def test_create_infile_edits_timeseries_results(
-        self, m_config, m_yaml, ensemble, ensemble_config
-    ):
-        ensemble.config = ensemble_config
-        ensemble.log = Mock()
-        with patch('bloomcast.ensemble.open', mock_open(), create=True):
-            ensemble._create_infile_edits()
-        result = m_yaml.safe_dump.call_args[0][0]['timeseries_results']
-        assert result['std_physics']['value'] == 'std_phys_bloomcast.out_8081'
-        expected_keys = (
-            'std_physics user_physics '
-            'std_biology user_biology '
-            'std_chemistry user_chemistry'
-            .split())
-        for key in expected_keys:
-            assert result[key]['value'] is not None
-        ensemble.log.debug.assert_called_once_with(
-            'wrote infile edit file foo_8081.yaml'
-        )
-
-    @patch('bloomcast.ensemble.yaml')
-    @patch('bloomcast.ensemble.utils.Config')
-    def test_create_infile_edits_profiles_results(
-        self, m_config, m_yaml, ensemble, ensemble_config
+    @pytest.mark.parametrize(
+        'section, expected_keys, first_key, first_value',
+        [
+            (
+                'forcing_data',
+                'avg_historical_wind_file avg_historical_air_temperature_file '
+                'avg_historical_cloud_file avg_historical_humidity_file '
+                'avg_historical_major_river_file '
+                'avg_historical_minor_river_file'.split(),
+                'avg_historical_wind_file',
+                'wind_data_8081',
+            ),
+            (
+                'timeseries_results',
+                'std_physics user_physics '
+                'std_biology user_biology '
+                'std_chemistry user_chemistry'.split(),
+                'std_physics',
+                'std_phys_bloomcast.out_8081',
+            ),
+            (
+                'profiles_results',
+                'profile_file_base user_profile_file_base '
+                'halocline_file '
+                'hoffmueller_file user_hoffmueller_file'.split(),
+                'profile_file_base',
+                'profiles/bloomcast_8081',
+            ),
+        ],
+    )
+    def test_create_infile_edits(
+        self, infile_edits, section, expected_keys, first_key, first_value,
     ):
-        ensemble.config = ensemble_config
-        ensemble.log = Mock()
-        with patch('bloomcast.ensemble.open', mock_open(), create=True):
-            ensemble._create_infile_edits()
-        result = m_yaml.safe_dump.call_args[0][0]['profiles_results']
-        expected = 'profiles/bloomcast_8081'
-        assert result['profile_file_base']['value'] == expected
-        expected_keys = (
-            'profile_file_base user_profile_file_base '
-            'halocline_file '
-            'hoffmueller_file user_hoffmueller_file'
-            .split())
+        ensemble, infile_edits_dict = infile_edits
+        result = infile_edits_dict[section]
+        assert result[first_key]['value'] == first_value
         for key in expected_keys:
             assert result[key]['value'] is not None
         ensemble.log.debug.assert_called_once_with(
@@ -210,14 +268,13 @@ class TestEnsembleTakeAction():
         )
 
     @patch('bloomcast.ensemble.yaml')
-    @patch('bloomcast.ensemble.utils.Config')
     def test_create_infile_edits_sets_edit_files_list_attr(
-        self, m_config, m_yaml, ensemble, ensemble_config
+        self, m_yaml, ensemble, ensemble_config, monkeypatch,
     ):
         ensemble.config = ensemble_config
-        ensemble.config.ensemble.end_year = 1982
+        monkeypatch.setattr(ensemble.config.ensemble, 'end_year', 1982)
         ensemble.log = Mock()
-        with patch('bloomcast.ensemble.open', mock_open(), create=True):
+        with patch('bloomcast.ensemble.open', _devnull_open, create=True):
             ensemble._create_infile_edits()
         assert ensemble.edit_files == [
             (1981, 'foo_8081.yaml', '_8081'),
@@ -225,15 +282,17 @@ class TestEnsembleTakeAction():
         ]
 
     @patch('bloomcast.ensemble.yaml')
-    def test_create_batch_description(self, m_yaml, ensemble, ensemble_config):
+    def test_create_batch_description(
+        self, m_yaml, ensemble, ensemble_config, monkeypatch,
+    ):
         ensemble.config = ensemble_config
-        ensemble.config.ensemble.end_year = 1982
+        monkeypatch.setattr(ensemble.config.ensemble, 'end_year', 1982)
         ensemble.log = Mock()
         ensemble.edit_files = [
             (1981, 'foo_8081.yaml', '_8081'),
             (1982, 'foo_8182.yaml', '_8182'),
         ]
-        with patch('bloomcast.ensemble.open', mock_open(), create=True):
+        with patch('bloomcast.ensemble.open', _devnull_open, create=True):
             ensemble._create_batch_description()
         result = m_yaml.safe_dump.call_args[0][0]
         expected = ensemble.config.ensemble.max_concurrent_jobs
@@ -272,48 +331,33 @@ class TestEnsembleTakeAction():
         ensemble.log.info.assert_called_once_with(
             'ensemble batch SOG runs completed with return code 0')
 
-    @patch('bloomcast.utils.SOG_Timeseries')
-    def test_load_biology_timeseries_instances(self, m_SOG_ts, ensemble, ensemble_config):
-        ensemble.config = ensemble_config
-        ensemble.edit_files = [(1981, 'foo_8081.yaml', '_8081')]
-        ensemble._load_biology_timeseries()
+    def test_load_biology_timeseries_instances(self, loaded_bio):
+        ensemble, m_SOG_ts = loaded_bio
         expected = [
             mock.call('std_bio_bloomcast.out_8081'),
             mock.call('std_bio_bloomcast.out_8081'),
         ]
         assert m_SOG_ts.call_args_list == expected
 
-    @patch('bloomcast.utils.SOG_Timeseries')
-    def test_load_biology_timeseries_read_nitrate(self, m_SOG_ts, ensemble, ensemble_config):
-        ensemble.config = ensemble_config
-        ensemble.edit_files = [(1981, 'foo_8081.yaml', '_8081')]
-        ensemble._load_biology_timeseries()
+    def test_load_biology_timeseries_read_nitrate(self, loaded_bio):
+        ensemble, m_SOG_ts = loaded_bio
         call = ensemble.nitrate_ts[1981].read_data.call_args_list[0]
         assert call == mock.call('time', '3 m avg nitrate concentration')
 
-    @patch('bloomcast.utils.SOG_Timeseries')
-    def test_load_biology_timeseries_read_diatoms(self, m_SOG_ts, ensemble, ensemble_config):
-        ensemble.config = ensemble_config
-        ensemble.edit_files = [(1981, 'foo_8081.yaml', '_8081')]
-        ensemble._load_biology_timeseries()
+    def test_load_biology_timeseries_read_diatoms(self, loaded_bio):
+        ensemble, m_SOG_ts = loaded_bio
         call = ensemble.diatoms_ts[1981].read_data.call_args_list[1]
         assert call == mock.call('time', '3 m avg micro phytoplankton biomass')
 
-    @patch('bloomcast.utils.SOG_Timeseries')
-    def test_load_biology_timeseries_mpl_dates(self, m_SOG_ts, ensemble, ensemble_config):
-        ensemble.config = ensemble_config
-        ensemble.edit_files = [(1981, 'foo_8081.yaml', '_8081')]
-        ensemble._load_biology_timeseries()
+    def test_load_biology_timeseries_mpl_dates(self, loaded_bio):
+        ensemble, m_SOG_ts = loaded_bio
         ensemble.nitrate_ts[1981].calc_mpl_dates.assert_called_with(
             ensemble.config.run_start_date)
         ensemble.diatoms_ts[1981].calc_mpl_dates.assert_called_with(
             ensemble.config.run_start_date)
 
-    @patch('bloomcast.utils.SOG_Timeseries')
-    def test_load_biology_timeseries_copies(self, m_SOG_ts, ensemble, ensemble_config):
-        ensemble.config = ensemble_config
-        ensemble.edit_files = [(1981, 'foo_8081.yaml', '_8081')]
-        ensemble._load_biology_timeseries()
+    def test_load_biology_timeseries_copies(self, loaded_bio):
+        ensemble, m_SOG_ts = loaded_bio
         assert ensemble.nitrate == ensemble.nitrate_ts
         assert ensemble.nitrate is not ensemble.nitrate_ts
         assert ensemble.diatoms == ensemble.diatoms_ts
@@ -325,45 +369,35 @@ def test_two_yr_suffix(ensemble_module):
     assert suffix == '_8081'
 
 
-def test_find_member_single_year_day_match(ensemble_module):
-    bloom_dates = {
-        2014: arrow.get(2014, 3, 26),
-    }
-    member = ensemble_module.find_member(bloom_dates, 735317)
-    assert member == 2014
-
-
-def test_find_member_multiple_year_day_matches(ensemble_module):
-    bloom_dates = {
-        2005: arrow.get(2014, 3, 25),
-        1997: arrow.get(2014, 3, 25),
-    }
-    member = ensemble_module.find_member(bloom_dates, 735316)
-    assert member == 2005
-
-
-def test_find_member_single_next_year_day_match(ensemble_module):
-    bloom_dates = {
-        1995: arrow.get(2014, 3, 27),
-        1991: arrow.get(2014, 3, 21),
-    }
-    member = ensemble_module.find_member(bloom_dates, 735317)
-    assert member == 1995
-
-
-def test_find_member_single_previous_year_day_match(ensemble_module):
-    bloom_dates = {
-        2005: arrow.get(2014, 3, 25),
-        1999: arrow.get(2014, 3, 29),
-    }
-    member = ensemble_module.find_member(bloom_dates, 735317)
-    assert member == 2005
-
-
-def test_find_member_multiple_previous_next_year_day_matches(ensemble_module):
-    bloom_dates = {
-        2005: arrow.get(2014, 3, 25),
-        1995: arrow.get(2014, 3, 27),
-    }
-    member = ensemble_module.find_member(bloom_dates, 735317)
-    assert member == 2005
+@pytest.mark.parametrize(
+    'bloom_dates, ord_day, expected',
+    [
+        ({2014: _D_2014_03_26}, 735317, 2014),
+        (
+            {2005: _D_2014_03_25, 1997: _D_2014_03_25},
+            735316, 2005,
+        ),
+        (
+            {1995: _D_2014_03_27, 1991: _D_2014_03_21},
+            735317, 1995,
+        ),
+        (
+            {2005: _D_2014_03_25, 1999: _D_2014_03_29},
+            735317, 2005,
+        ),
+        (
+            {2005: _D_2014_03_25, 1995: _D_2014_03_27},
+            735317, 2005,
+        ),
+    ],
+    ids=[
+        'single_year_day_match',
+        'multiple_year_day_matches',
+        'single_next_year_day_match',
+        'single_previous_year_day_match',
+        'multiple_previous_next_year_day_matches',
+    ],
+)
+def test_find_member(ensemble_module, bloom_dates, ord_day, expected):
+    member = ensemble_module.find_member(bloom_dates, ord_day)
+    assert member == expected
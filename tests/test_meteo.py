@@ -15,15 +15,23 @@
 """Unit tests for SoG-bloomcast meteo module.
 """
 import datetime
-
+from types import SimpleNamespace
 from unittest.mock import Mock
+
 import pytest
 
 
+# A day of hourly air temperature data, and its forcing data file line
+_AT_DATA = [
+    (datetime.datetime(2011, 9, 25, i, 0, 0), 215.0) for i in range(24)]
+_EXPECTED_AT_LINE = '889 2011 09 25 42' + ' 215.00' * 24 + '\n'
+
+
 @pytest.fixture
 def meteo():
     from bloomcast.meteo import MeteoProcessor
-    return MeteoProcessor(Mock(name='config'))
+    config = SimpleNamespace(climate=SimpleNamespace(meteo=SimpleNamespace()))
+    return MeteoProcessor(config)
 
 
 class TestMeteoProcessor():
@@ -64,8 +72,6 @@ class TestMeteoProcessor():
         """format_data generator returns formatted forcing data file line
         """
         meteo.config.climate.meteo.station_id = '889'
-        meteo.data['air_temperature'] = [
-            (datetime.datetime(2011, 9, 25, i, 0, 0), 215.0)
-            for i in range(24)]
+        meteo.data['air_temperature'] = _AT_DATA
         line = next(meteo.format_data('air_temperature'))
-        assert line == '889 2011 09 25 42' + ' 215.00' * 24 + '\n'
+        assert line == _EXPECTED_AT_LINE
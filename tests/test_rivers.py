@@ -15,29 +15,133 @@
 """Unit tests for SoG-bloomcast rivers module.
 """
 import datetime
-from unittest.mock import (
-    Mock,
-    patch,
-)
+from types import SimpleNamespace
+from unittest.mock import Mock
 
-import arrow
 import bs4
 import pytest
 
 
-@pytest.fixture
+# process_data test fixtures
+_HTML_1_ROW = (
+    '<table>'
+    '  <tr>'
+    '    <td>2011-09-27 21:11:00</td>'
+    '    <td>4200.0</td>'
+    '  </tr>'
+    '</table>'
+)
+
+_HTML_MINOR_RIVER_1_ROW = (
+    '<table>'
+    '  <tr>'
+    '    <td>2021-02-24 17:04:00</td>'
+    '    <td>10.0</td>'
+    '  </tr>'
+    '</table>'
+)
+
+_HTML_DATA_ORDER_1_ROW = (
+    '<table>'
+    '  <tr>'
+    '    <td>2011-09-27 21:11:00</td>'
+    '    <td data-order="4199.95915878108">4,200*</td>'
+    '  </tr>'
+    '</table>'
+)
+
+_HTML_2_ROWS_1_DAY = (
+    '<table>'
+    '  <tr>'
+    '    <td>2011-09-27 21:11:00</td>'
+    '    <td>4200.0</td>'
+    '  </tr>'
+    '  <tr>'
+    '    <td>2011-09-27 21:35:00</td>'
+    '    <td>4400.0</td>'
+    '  </tr>'
+    '</table>'
+)
+
+_HTML_2_ROWS_2_DAYS = (
+    '<table>'
+    '  <tr>'
+    '    <td>2011-09-27 21:11:00</td>'
+    '    <td>4200.0</td>'
+    '  </tr>'
+    '  <tr>'
+    '    <td>2011-09-28 21:35:00</td>'
+    '    <td>4400.0</td>'
+    '  </tr>'
+    '</table>'
+)
+
+_HTML_4_ROWS_2_DAYS = (
+    '<table>'
+    '  <tr>'
+    '    <td>2011-09-27 21:11:00</td>'
+    '    <td>4200.0</td>'
+    '  </tr>'
+    '  <tr>'
+    '    <td>2011-09-27 21:35:00</td>'
+    '    <td>4400.0</td>'
+    '  <tr>'
+    '    <td>2011-09-28 21:11:00</td>'
+    '    <td>3200.0</td>'
+    '  </tr>'
+    '  <tr>'
+    '    <td>2011-09-28 21:35:00</td>'
+    '    <td>3400.0</td>'
+    '  </tr>'
+    '</table>'
+)
+
+
+def _soup(html):
+    """Return the table element from an HTML test fixture string,
+    parsed the same way as RiversProcessor.get_river_data parses the
+    WaterOffice page.
+    """
+    from bloomcast.rivers import _TABLE_STRAINER
+    soup = bs4.BeautifulSoup(html, 'lxml', parse_only=_TABLE_STRAINER)
+    return soup.find('table')
+
+
+# process_data only reads from its raw_data, so the test fixtures can be
+# parsed once and shared
+_SOUP_1_ROW = _soup(_HTML_1_ROW)
+_SOUP_MINOR_RIVER_1_ROW = _soup(_HTML_MINOR_RIVER_1_ROW)
+_SOUP_DATA_ORDER_1_ROW = _soup(_HTML_DATA_ORDER_1_ROW)
+_SOUP_2_ROWS_1_DAY = _soup(_HTML_2_ROWS_1_DAY)
+_SOUP_2_ROWS_2_DAYS = _soup(_HTML_2_ROWS_2_DAYS)
+_SOUP_4_ROWS_2_DAYS = _soup(_HTML_4_ROWS_2_DAYS)
+
+
+@pytest.fixture(scope='class')
 def processor():
     from bloomcast.rivers import RiversProcessor
-    return RiversProcessor(Mock(name='config'))
+    return RiversProcessor(SimpleNamespace())
+
+
+@pytest.fixture
+def mock_log(monkeypatch):
+    m_log = Mock(name='log')
+    monkeypatch.setattr('bloomcast.rivers.log', m_log)
+    return m_log
 
 
 class TestRiverProcessor():
     """Uni tests for RiverProcessor object.
     """
-    def test_date_params(self, processor):
+    @pytest.mark.parametrize(
+        'data_date',
+        [datetime.date(2011, 11, 30), datetime.datetime(2011, 11, 30)],
+        ids=['date', 'datetime'],
+    )
+    def test_date_params(self, data_date, processor):
         """_date_params handles month-end rollover correctly
         """
-        processor.config.data_date = arrow.get(2011, 11, 30)
+        processor.config.data_date = data_date
         expected = {
             'startDate': '2011-01-01',
             'endDate': '2011-12-01',
@@ -47,15 +151,8 @@ class TestRiverProcessor():
     def test_process_data_1_row(self, processor):
         """process_data produces expected result for 1 row of data
         """
-        test_data = [
-            '<table>',
-            '  <tr>',
-            '    <td>2011-09-27 21:11:00</td>',
-            '    <td>4200.0</td>',
-            '  </tr>',
-            '</table>',
-        ]
-        processor.raw_data = bs4.BeautifulSoup(''.join(test_data), features="html.parser")
+        processor.data = {}
+        processor.raw_data = _SOUP_1_ROW
         processor.process_data('major')
         assert processor.data['major'] == [(datetime.date(2011, 9, 27), 4200.0)]
 
@@ -64,53 +161,71 @@ class TestRiverProcessor():
         re: 25-Sep-2020 failure of Englishman River gauge data stream and replacement of it
         with scaled Nanaimo River values for 2021 predictions
         """
-        test_data = [
-            '<table>',
-            '  <tr>',
-            '    <td>2021-02-24 17:04:00</td>',
-            '    <td>10.0</td>',
-            '  </tr>',
-            '</table>',
-        ]
-        processor.raw_data = bs4.BeautifulSoup(''.join(test_data), features="html.parser")
+        processor.data = {}
+        processor.raw_data = _SOUP_MINOR_RIVER_1_ROW
         processor.process_data('major', 0.351)
         assert processor.data['major'] == [(datetime.date(2021, 2, 24), 3.51)]
 
+    def test_process_data_data_order_attr(self, processor):
+        """process_data uses flow value from data-order attribute if present
+        """
+        processor.data = {}
+        processor.raw_data = _SOUP_DATA_ORDER_1_ROW
+        processor.process_data('major')
+        expected = [(datetime.date(2011, 9, 27), 4199.95915878108)]
+        assert processor.data['major'] == expected
+
+    @pytest.mark.parametrize('data_order', ['', 'n/a'])
+    def test_process_data_bad_data_order_attr(self, data_order, processor):
+        """process_data uses display text if data-order isn't a number
+        """
+        processor.data = {}
+        processor.raw_data = _soup(
+            '<table>'
+            '  <tr>'
+            '    <td>2011-09-27 21:11:00</td>'
+            '    <td data-order="{}">4,200*</td>'
+            '  </tr>'
+            '</table>'.format(data_order))
+        processor.process_data('major')
+        assert processor.data['major'] == [(datetime.date(2011, 9, 27), 4200.0)]
+
+    @pytest.mark.parametrize(
+        'html',
+        [
+            '<table>'
+            '  <tr>'
+            '    <th>Date</th>'
+            '    <th>Discharge</th>'
+            '  </tr>'
+            '</table>',
+            _HTML_1_ROW,
+        ],
+        ids=['header_only', 'all_after_end_date'],
+    )
+    def test_process_data_no_rows_raises(self, html, processor):
+        """process_data raises ValueError if no data rows are left
+        """
+        processor.data = {}
+        processor.raw_data = _soup(html)
+        with pytest.raises(ValueError):
+            processor.process_data(
+                'major', end_date=datetime.datetime(2011, 9, 26))
+        assert 'major' not in processor.data
+
     def test_process_data_2_rows_1_day(self, processor):
         """process_data produces result for 2 rows of data from same day
         """
-        test_data = [
-            '<table>',
-            '  <tr>',
-            '    <td>2011-09-27 21:11:00</td>',
-            '    <td>4200.0</td>',
-            '  </tr>',
-            '  <tr>',
-            '    <td>2011-09-27 21:35:00</td>',
-            '    <td>4400.0</td>',
-            '  </tr>',
-            '</table>',
-        ]
-        processor.raw_data = bs4.BeautifulSoup(''.join(test_data), features="html.parser")
+        processor.data = {}
+        processor.raw_data = _SOUP_2_ROWS_1_DAY
         processor.process_data('major')
         assert processor.data['major'] == [(datetime.date(2011, 9, 27), 4300.0)]
 
     def test_process_data_2_rows_2_days(self, processor):
         """process_data produces expected result for 2 rows of data from 2 days
         """
-        test_data = [
-            '<table>',
-            '  <tr>',
-            '    <td>2011-09-27 21:11:00</td>',
-            '    <td>4200.0</td>',
-            '  </tr>',
-            '  <tr>',
-            '    <td>2011-09-28 21:35:00</td>',
-            '    <td>4400.0</td>',
-            '  </tr>',
-            '</table>',
-        ]
-        processor.raw_data = bs4.BeautifulSoup(''.join(test_data), features="html.parser")
+        processor.data = {}
+        processor.raw_data = _SOUP_2_ROWS_2_DAYS
         processor.process_data('major')
         expected = [
             (datetime.date(2011, 9, 27), 4200.0),
@@ -121,26 +236,8 @@ class TestRiverProcessor():
     def test_process_data_4_rows_2_days(self, processor):
         """process_data produces expected result for 4 rows of data from 2 days
         """
-        test_data = [
-            '<table>',
-            '  <tr>',
-            '    <td>2011-09-27 21:11:00</td>',
-            '    <td>4200.0</td>',
-            '  </tr>',
-            '  <tr>',
-            '    <td>2011-09-27 21:35:00</td>',
-            '    <td>4400.0</td>',
-            '  <tr>',
-            '    <td>2011-09-28 21:11:00</td>',
-            '    <td>3200.0</td>',
-            '  </tr>',
-            '  <tr>',
-            '    <td>2011-09-28 21:35:00</td>',
-            '    <td>3400.0</td>',
-            '  </tr>',
-            '</table>',
-        ]
-        processor.raw_data = bs4.BeautifulSoup(''.join(test_data), features="html.parser")
+        processor.data = {}
+        processor.raw_data = _SOUP_4_ROWS_2_DAYS
         processor.process_data('major')
         expected = [
             (datetime.date(2011, 9, 27), 4300.0),
@@ -151,114 +248,74 @@ class TestRiverProcessor():
     def test_format_data(self, processor):
         """format_data generator returns formatted forcing data file line
         """
+        processor.data = {}
         processor.data['major'] = [
             (datetime.date(2011, 9, 27), 4200.0)
         ]
         line = next(processor.format_data('major'))
         assert line == '2011 09 27 4.200000e+03\n'
 
-    def test_patch_data_1_day_gap(self, processor):
-        """patch_data correctly flags 1 day gap in data for interpolation
-        """
-        processor.data['major'] = [
-            (datetime.date(2011, 10, 23), 4300.0),
-            (datetime.date(2011, 10, 25), 4500.0),
-        ]
-        processor.interpolate_values = Mock(name='interpolate_values')
-        with patch('bloomcast.rivers.log') as mock_log:
-            processor.patch_data('major')
-        expected = (datetime.date(2011, 10, 24), None)
-        assert processor.data['major'][1] == expected
-        expected = [
-            (('major river data patched for 2011-10-24',),),
-            (('1 major river data values patched; '
-              'see debug log on disk for details',),),
-        ]
-        assert mock_log.debug.call_args_list == expected
-        processor.interpolate_values.assert_called_once_with(
-            'major', 1, 1)
-
-    def test_patch_data_2_day_gap(self, processor):
-        """patch_data correctly flags 2 day gap in data for interpolation
-        """
-        processor.data['major'] = [
-            (datetime.date(2011, 10, 23), 4300.0),
-            (datetime.date(2011, 10, 26), 4600.0),
-        ]
-        processor.interpolate_values = Mock(name='interpolate_values')
-        with patch('bloomcast.rivers.log') as mock_log:
-            processor.patch_data('major')
-        expected = [
-            (datetime.date(2011, 10, 24), None),
-            (datetime.date(2011, 10, 25), None),
-        ]
-        assert processor.data['major'][1:3] == expected
-        expected = [
-            (('major river data patched for 2011-10-24',),),
-            (('major river data patched for 2011-10-25',),),
-            (('2 major river data values patched; '
-              'see debug log on disk for details',),),
-        ]
-        assert mock_log.debug.call_args_list == expected
-        processor.interpolate_values.assert_called_once_with(
-            'major', 1, 2)
-
-    def test_patch_data_2_gaps(self, processor):
-        """patch_data correctly flags 2 gaps in data for interpolation
+    @pytest.mark.parametrize(
+        'input_days, expected_patched_days, expected_calls',
+        [
+            ((23, 25), [24], [('major', 1, 1)]),
+            ((23, 26), [24, 25], [('major', 1, 2)]),
+            (
+                (23, 25, 26, 29), [24, 27, 28],
+                [('major', 1, 1), ('major', 4, 5)],
+            ),
+        ],
+        ids=['1_day_gap', '2_day_gap', '2_gaps'],
+    )
+    def test_patch_data(
+        self, input_days, expected_patched_days, expected_calls,
+        processor, mock_log, monkeypatch,
+    ):
+        """patch_data correctly flags gaps in data for interpolation
         """
+        processor.data = {}
         processor.data['major'] = [
-            (datetime.date(2011, 10, 23), 4300.0),
-            (datetime.date(2011, 10, 25), 4500.0),
-            (datetime.date(2011, 10, 26), 4500.0),
-            (datetime.date(2011, 10, 29), 4200.0),
-        ]
-        processor.interpolate_values = Mock(name='interpolate_values')
-        with patch('bloomcast.rivers.log') as mock_log:
-            processor.patch_data('major')
-        expected = (datetime.date(2011, 10, 24), None)
-        assert processor.data['major'][1] == expected
+            (datetime.date(2011, 10, day), 4000.0 + day)
+            for day in input_days]
+        monkeypatch.setattr(
+            processor, 'interpolate_values', Mock(name='interpolate_values'))
+        processor.patch_data('major')
         expected = [
-            (datetime.date(2011, 10, 27), None),
-            (datetime.date(2011, 10, 28), None),
-        ]
-        assert processor.data['major'][4:6] == expected
+            (datetime.date(2011, 10, day),
+             None if day in expected_patched_days else 4000.0 + day)
+            for day in range(input_days[0], input_days[-1] + 1)]
+        assert processor.data['major'] == expected
         expected = [
-            (('major river data patched for 2011-10-24',),),
-            (('major river data patched for 2011-10-27',),),
-            (('major river data patched for 2011-10-28',),),
-            (('3 major river data values patched; '
-              'see debug log on disk for details',),),
-        ]
+            (('%s river data patched for %s',
+              'major', datetime.date(2011, 10, day)),)
+            for day in expected_patched_days]
+        expected.append(
+            (('{} major river data values patched; '
+              'see debug log on disk for details'
+              .format(len(expected_patched_days)),),))
         assert mock_log.debug.call_args_list == expected
-        expected = [(('major', 1, 1),), (('major', 4, 5),)]
+        expected = [(args,) for args in expected_calls]
         assert processor.interpolate_values.call_args_list == expected
 
-    def test_interpolate_values_1_day_gap(self, processor):
-        """interpolate_values interpolates value for 1 day gap in data
-        """
-        processor.data = {}
-        processor.data['major'] = [
-            (datetime.date(2011, 10, 23), 4300.0),
-            (datetime.date(2011, 10, 24), None),
-            (datetime.date(2011, 10, 25), 4500.0),
-        ]
-        processor.interpolate_values('major', 1, 1)
-        expected = (datetime.date(2011, 10, 24), 4400.0)
-        assert processor.data['major'][1] == expected
-
-    def test_interpolate_values_2_day_gap(self, processor):
-        """interpolate_values interpolates value for 2 day gap in data
+    @pytest.mark.parametrize(
+        'input_values, gap_end, expected_values',
+        [
+            ((4300.0, None, 4500.0), 1, [4400.0]),
+            ((4300.0, None, None, 4600.0), 2, [4400.0, 4500.0]),
+        ],
+        ids=['1_day_gap', '2_day_gap'],
+    )
+    def test_interpolate_values(
+        self, input_values, gap_end, expected_values, processor,
+    ):
+        """interpolate_values interpolates values for gaps in data
         """
         processor.data = {}
         processor.data['major'] = [
-            (datetime.date(2011, 10, 23), 4300.0),
-            (datetime.date(2011, 10, 24), None),
-            (datetime.date(2011, 10, 25), None),
-            (datetime.date(2011, 10, 26), 4600.0),
-        ]
-        processor.interpolate_values('major', 1, 2)
+            (datetime.date(2011, 10, 23 + i), value)
+            for i, value in enumerate(input_values)]
+        processor.interpolate_values('major', 1, gap_end)
         expected = [
-            (datetime.date(2011, 10, 24), 4400.0),
-            (datetime.date(2011, 10, 25), 4500.0),
-        ]
-        assert processor.data['major'][1:3] == expected
+            (datetime.date(2011, 10, 24 + i), value)
+            for i, value in enumerate(expected_values)]
+        assert processor.data['major'][1:gap_end + 1] == expected
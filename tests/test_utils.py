@@ -15,8 +15,8 @@
 """Unit tests for SoG-bloomcast utils module.
 """
 import datetime
+from types import SimpleNamespace
 from unittest.mock import (
-    DEFAULT,
     Mock,
     patch,
 )
@@ -24,13 +24,46 @@ from unittest.mock import (
 import pytest
 
 
+# Hourly timestamps for ForcingDataProcessor data lists
+_T0 = datetime.datetime(2011, 9, 25, 9, 0, 0)
+_T = [_T0 + datetime.timedelta(hours=i) for i in range(6)]
+
+# Data list pieces for a 15 hour gap
+_BASE = datetime.datetime(2014, 2, 11, 0, 0, 0)
+_HEAD = (_BASE, 15.0)
+_GAP = [(_BASE + datetime.timedelta(hours=i + 1), None) for i in range(15)]
+_TAIL = (_BASE + datetime.timedelta(hours=16), 30.0)
+
+# Expected patch_data debug log calls
+_EXPECTED_1HR = [
+    (('%s data patched for %s', 'air_temperature', _T[1]),),
+    (('1 air_temperature data values patched; '
+      'see debug log on disk for details',),),
+]
+_EXPECTED_2HR = [
+    (('%s data patched for %s', 'air_temperature', _T[1]),),
+    (('%s data patched for %s', 'air_temperature', _T[2]),),
+    (('2 air_temperature data values patched; '
+      'see debug log on disk for details',),),
+]
+_EXPECTED_2GAPS = [
+    (('%s data patched for %s', 'air_temperature', _T[1]),),
+    (('%s data patched for %s', 'air_temperature', _T[2]),),
+    (('%s data patched for %s', 'air_temperature', _T[4]),),
+    (('3 air_temperature data values patched; '
+      'see debug log on disk for details',),),
+]
+
+
 @pytest.fixture
 def config():
     from bloomcast.utils import Config
     return Config()
 
 
-@pytest.fixture(scope='function')
+# Shared by the tests in the module; tests must only change it via
+# monkeypatch.setitem() so that their changes are undone
+@pytest.fixture(scope='module')
 def config_dict():
     config_dict = {
         'get_forcing_data': None,
@@ -80,7 +113,9 @@ def config_dict():
     return config_dict
 
 
-@pytest.fixture(scope='function')
+# Shared by the tests in the module; tests must only change it via
+# monkeypatch.setitem() so that their changes are undone
+@pytest.fixture(scope='module')
 def infile_dict():
     infile_dict = {
         'run_start_date': datetime.datetime(2011, 11, 11, 12, 33, 42),
@@ -111,17 +146,17 @@ def infile_dict():
 @pytest.fixture
 def forcing_processor():
     from bloomcast.utils import ForcingDataProcessor
-    return ForcingDataProcessor(Mock(name='config'))
+    return ForcingDataProcessor(SimpleNamespace())
 
 
 @pytest.fixture
 def climate_processor():
     from bloomcast.utils import ClimateDataProcessor
-    mock_config = Mock(name='config')
-    mock_config.climate.params = {}
-    mock_config.run_start_date = datetime.date(2011, 9, 19)
-    mock_data_readers = Mock(name='data_readers')
-    return ClimateDataProcessor(mock_config, mock_data_readers)
+    config = SimpleNamespace(
+        climate=SimpleNamespace(params={}),
+        run_start_date=datetime.date(2011, 9, 19),
+    )
+    return ClimateDataProcessor(config, data_readers={})
 
 
 class TestConfig():
@@ -171,12 +206,11 @@ class TestConfig():
             'Clear': [0.0] * 12,
         }
         config.climate = Mock()
-
-        def side_effect(config_file):   # NOQA
-            return (DEFAULT if config_file == 'config_file'
-                    else test_cloud_fraction_mapping)
-        config._read_yaml_file = Mock(
-            return_value=config_dict, side_effect=side_effect)
+        yaml_files = {
+            'config_file': config_dict,
+            test_cloud_fraction_mapping_file: test_cloud_fraction_mapping,
+        }
+        config._read_yaml_file = Mock(side_effect=yaml_files.get)
         config._load_meteo_config(config_dict, infile_dict)
         expected = test_cloud_fraction_mapping
         assert config.climate.meteo.cloud_fraction_mapping == expected
@@ -245,23 +279,33 @@ class TestConfig():
 class TestForcingDataProcessor():
     """Unit tests for ForcingDataProcessor object.
     """
+    def test_patch_data_no_gaps(self, forcing_processor):
+        """patch_data doesn't interpolate or log when data has no gaps
+        """
+        forcing_processor.data['air_temperature'] = [
+            (_T[0], 215.0),
+            (_T[1], 225.0),
+            (_T[2], 235.0),
+        ]
+        forcing_processor.interpolate_values = Mock(name='interpolate_values')
+        with patch('bloomcast.utils.log') as mock_log:
+            forcing_processor.patch_data('air_temperature')
+        assert not mock_log.debug.called
+        assert not mock_log.warning.called
+        assert not forcing_processor.interpolate_values.called
+
     def test_patch_data_1_hour_gap(self, forcing_processor):
         """patch_data correctly flags 1 hour gap in data for interpolation
         """
         forcing_processor.data['air_temperature'] = [
-            (datetime.datetime(2011, 9, 25, 9, 0, 0), 215.0),
-            (datetime.datetime(2011, 9, 25, 10, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 11, 0, 0), 235.0),
+            (_T[0], 215.0),
+            (_T[1], None),
+            (_T[2], 235.0),
         ]
         forcing_processor.interpolate_values = Mock(name='interpolate_values')
         with patch('bloomcast.utils.log') as mock_log:
             forcing_processor.patch_data('air_temperature')
-        expected = [
-            (('air_temperature data patched for 2011-09-25 10:00:00',),),
-            (('1 air_temperature data values patched; '
-              'see debug log on disk for details',),),
-        ]
-        assert mock_log.debug.call_args_list == expected
+        assert mock_log.debug.call_args_list == _EXPECTED_1HR
         forcing_processor.interpolate_values.assert_called_once_with(
             'air_temperature', 1, 1)
 
@@ -270,21 +314,15 @@ class TestForcingDataProcessor():
         """
         forcing_processor.data = {}
         forcing_processor.data['air_temperature'] = [
-            (datetime.datetime(2011, 9, 25, 9, 0, 0), 215.0),
-            (datetime.datetime(2011, 9, 25, 10, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 11, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 12, 0, 0), 230.0),
+            (_T[0], 215.0),
+            (_T[1], None),
+            (_T[2], None),
+            (_T[3], 230.0),
         ]
         forcing_processor.interpolate_values = Mock()
         with patch('bloomcast.utils.log') as mock_log:
             forcing_processor.patch_data('air_temperature')
-        expected = [
-            (('air_temperature data patched for 2011-09-25 10:00:00',),),
-            (('air_temperature data patched for 2011-09-25 11:00:00',),),
-            (('2 air_temperature data values patched; '
-              'see debug log on disk for details',),),
-        ]
-        assert mock_log.debug.call_args_list == expected
+        assert mock_log.debug.call_args_list == _EXPECTED_2HR
         forcing_processor.interpolate_values.assert_called_once_with(
             'air_temperature', 1, 2)
 
@@ -292,24 +330,17 @@ class TestForcingDataProcessor():
         """patch_data correctly flags 2 gaps in data for interpolation
         """
         forcing_processor.data['air_temperature'] = [
-            (datetime.datetime(2011, 9, 25, 9, 0, 0), 215.0),
-            (datetime.datetime(2011, 9, 25, 10, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 11, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 12, 0, 0), 230.0),
-            (datetime.datetime(2011, 9, 25, 13, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 14, 0, 0), 250.0),
+            (_T[0], 215.0),
+            (_T[1], None),
+            (_T[2], None),
+            (_T[3], 230.0),
+            (_T[4], None),
+            (_T[5], 250.0),
         ]
         forcing_processor.interpolate_values = Mock()
         with patch('bloomcast.utils.log') as mock_log:
             forcing_processor.patch_data('air_temperature')
-        expected = [
-            (('air_temperature data patched for 2011-09-25 10:00:00',),),
-            (('air_temperature data patched for 2011-09-25 11:00:00',),),
-            (('air_temperature data patched for 2011-09-25 13:00:00',),),
-            (('3 air_temperature data values patched; '
-              'see debug log on disk for details',),),
-        ]
-        assert mock_log.debug.call_args_list == expected
+        assert mock_log.debug.call_args_list == _EXPECTED_2GAPS
         expected = [(('air_temperature', 1, 2),), (('air_temperature', 4, 4),)]
         assert forcing_processor.interpolate_values.call_args_list == expected
 
@@ -318,12 +349,12 @@ class TestForcingDataProcessor():
         """
         forcing_processor.data = {}
         forcing_processor.data['air_temperature'] = [
-            (datetime.datetime(2011, 9, 25, 9, 0, 0), 215.0),
-            (datetime.datetime(2011, 9, 25, 10, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 11, 0, 0), 235.0),
+            (_T[0], 215.0),
+            (_T[1], None),
+            (_T[2], 235.0),
         ]
         forcing_processor.interpolate_values('air_temperature', 1, 1)
-        expected = (datetime.datetime(2011, 9, 25, 10, 0, 0), 225.0)
+        expected = (_T[1], 225.0)
         assert forcing_processor.data['air_temperature'][1] == expected
 
     def test_interpolate_values_2_hour_gap(self, forcing_processor):
@@ -331,15 +362,15 @@ class TestForcingDataProcessor():
         """
         forcing_processor.data = {}
         forcing_processor.data['air_temperature'] = [
-            (datetime.datetime(2011, 9, 25, 9, 0, 0), 215.0),
-            (datetime.datetime(2011, 9, 25, 10, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 11, 0, 0), None),
-            (datetime.datetime(2011, 9, 25, 12, 0, 0), 230.0),
+            (_T[0], 215.0),
+            (_T[1], None),
+            (_T[2], None),
+            (_T[3], 230.0),
         ]
         forcing_processor.interpolate_values('air_temperature', 1, 2)
-        expected = (datetime.datetime(2011, 9, 25, 10, 0, 0), 220.0)
+        expected = (_T[1], 220.0)
         assert forcing_processor.data['air_temperature'][1] == expected
-        expected = (datetime.datetime(2011, 9, 25, 11, 0, 0), 225.0)
+        expected = (_T[2], 225.0)
         assert forcing_processor.data['air_temperature'][2] == expected
 
     def test_interpolate_values_gap_gt_11_hr_logs_warning(
@@ -347,14 +378,8 @@ class TestForcingDataProcessor():
     ):
         """data gap >11 hr generates warning log message
         """
-        forcing_processor.data['air_temperature'] = [
-            (datetime.datetime(2014, 2, 11, 0, 0, 0), 15.0)
-        ]
-        forcing_processor.data['air_temperature'].extend([
-            (datetime.datetime(2014, 2, 11, 1 + i, 0, 0), None)
-            for i in range(15)])
-        forcing_processor.data['air_temperature'].append(
-            (datetime.datetime(2014, 2, 11, 16, 0, 0), 30.0))
+        forcing_processor.data['air_temperature'] = (
+            [_HEAD] + _GAP + [_TAIL])
         with patch('bloomcast.utils.log', Mock()) as mock_log:
             forcing_processor.interpolate_values(
                 'air_temperature', gap_start=1, gap_end=15)
@@ -15,62 +15,56 @@
 """Unit tests for SoG-bloomcast wind module.
 """
 import datetime
-from unittest.mock import (
-    Mock,
-    patch,
-)
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
 
-@pytest.fixture
+# Hourly timestamps for wind data lists
+_H = [datetime.datetime(2011, 9, 25, h, 0, 0) for h in range(24)]
+
+
+# Tests replace the wind data list that they work on, so the processor
+# can be shared
+@pytest.fixture(scope='module')
 def wind():
     from bloomcast.wind import WindProcessor
-    return WindProcessor(Mock(name='config'))
+    return WindProcessor(SimpleNamespace())
 
 
 class TestWindProcessor():
     """Unit tests for WindProcessor object.
     """
-    def test_interpolate_values_1_hour_gap(self, wind):
-        """interpolate_values interpolates value for 1 hour gap in data
-        """
-        wind.data['wind'] = [
-            (datetime.datetime(2011, 9, 25, 9, 0, 0), (1.0, -2.0)),
-            (datetime.datetime(2011, 9, 25, 10, 0, 0), (None, None)),
-            (datetime.datetime(2011, 9, 25, 11, 0, 0), (2.0, -1.0)),
-        ]
-        wind.interpolate_values('wind', 1, 1)
-        expected = (datetime.datetime(2011, 9, 25, 10, 0, 0), (1.5, -1.5))
-        assert wind.data['wind'][1] == expected
-
-    def test_interpolate_values_2_hour_gap(self, wind):
-        """interpolate_values interpolates value for 2 hour gap in data
+    @pytest.mark.parametrize('gap_hours', [1, 2, 3, 6, 11])
+    def test_interpolate_values(self, gap_hours, wind):
+        """interpolate_values interpolates values for gaps of up to 11 hr
         """
-        wind.data['wind'] = [
-            (datetime.datetime(2011, 9, 25, 9, 0, 0), (1.0, -2.0)),
-            (datetime.datetime(2011, 9, 25, 10, 0, 0), (None, None)),
-            (datetime.datetime(2011, 9, 25, 11, 0, 0), (None, None)),
-            (datetime.datetime(2011, 9, 25, 12, 0, 0), (2.5, -0.5)),
-        ]
-        wind.interpolate_values('wind', 1, 2)
-        expected = (datetime.datetime(2011, 9, 25, 10, 0, 0), (1.5, -1.5))
-        assert wind.data['wind'][1] == expected
-        expected = (datetime.datetime(2011, 9, 25, 11, 0, 0), (2.0, -1.0))
-        assert wind.data['wind'][2] == expected
+        # Both components change by 0.5 per hour across the gap
+        wind.data['wind'] = (
+            [(_H[9], (1.0, -2.0))]
+            + [(_H[10 + i], (None, None)) for i in range(gap_hours)]
+            + [(_H[10 + gap_hours],
+                (1.0 + (gap_hours + 1) * 0.5, -2.0 + (gap_hours + 1) * 0.5))]
+        )
+        wind.interpolate_values('wind', 1, gap_hours)
+        expected = [
+            (_H[10 + i], (1.0 + (i + 1) * 0.5, -2.0 + (i + 1) * 0.5))
+            for i in range(gap_hours)]
+        assert wind.data['wind'][1:gap_hours + 1] == expected
 
     def test_interpolate_values_gap_gt_11_hr_logs_warning(self, wind):
         """wind data gap >11 hr generates warning log message
         """
         wind.data['wind'] = [
-            (datetime.datetime(2011, 9, 25, 0, 0, 0), (1.0, -2.0))
+            (_H[0], (1.0, -2.0))
         ]
         wind.data['wind'].extend([
-            (datetime.datetime(2011, 9, 25, 1 + i, 0, 0), (None, None))
+            (_H[1 + i], (None, None))
             for i in range(15)])
         wind.data['wind'].append(
-            (datetime.datetime(2011, 9, 25, 16, 0, 0), (1.0, -2.0)))
-        with patch('bloomcast.wind.log', Mock()) as mock_log:
+            (_H[16], (1.0, -2.0)))
+        with patch('bloomcast.wind.log') as mock_log:
             wind.interpolate_values('wind', gap_start=1, gap_end=15)
             mock_log.warning.assert_called_once_with(
                 'A wind forcing data gap > 11 hr starting at 2011-09-25 01:00 '
@@ -80,7 +74,45 @@ class TestWindProcessor():
         """format_data generator returns formatted forcing data file line
         """
         wind.data['wind'] = [
-            (datetime.datetime(2011, 9, 25, 9, 0, 0), (1.0, 2.0)),
+            (_H[9], (1.0, 2.0)),
         ]
         line = next(wind.format_data())
         assert line == '25 09 2011 9.0 1.000000 2.000000\n'
+
+    def test_format_data_full_precision(self, wind):
+        """format_data writes wind components to 6 decimal places
+        """
+        wind.data['wind'] = [
+            (_H[9], (123.456789, -0.000001)),
+        ]
+        line = next(wind.format_data())
+        assert line == '25 09 2011 9.0 123.456789 -0.000001\n'
+
+
+class TestWindTimeseries():
+    """Unit tests for WindTimeseries object.
+    """
+    def test_read_data(self, tmp_path):
+        """read_data returns hours since run start and wind speeds
+        """
+        from bloomcast.wind import WindTimeseries
+        datafile = tmp_path / 'wind_data'
+        datafile.write_text(
+            '31 12 2011 23.0 1.000000 2.000000\n'
+            '01 01 2012 0.0 3.000000 4.000000\n'
+            '01 01 2012 1.0 -6.000000 8.000000\n')
+        wind_ts = WindTimeseries(str(datafile))
+        wind_ts.read_data(datetime.datetime(2012, 1, 1))
+        assert wind_ts.indep_data.tolist() == [0.0, 1.0]
+        assert wind_ts.dep_data.tolist() == [5.0, 10.0]
+
+    def test_read_data_empty_file(self, tmp_path):
+        """read_data returns empty arrays for an empty data file
+        """
+        from bloomcast.wind import WindTimeseries
+        datafile = tmp_path / 'wind_data'
+        datafile.write_text('')
+        wind_ts = WindTimeseries(str(datafile))
+        wind_ts.read_data(datetime.datetime(2012, 1, 1))
+        assert wind_ts.indep_data.size == 0
+        assert wind_ts.dep_data.size == 0